@@ -27,6 +27,8 @@ def post_mpl(mpl, trial, db):
 
 # This dictionary must be defined
 # All hooks are run in the order listed for each hook location
+# Note: DB, trial and MPL hooks for DBMSes with parallel_dbs enabled may be
+# called concurrently from several threads
 HOOKS = {
     "PRE_RUN"   : [pre_run],
     "POST_RUN"  : [post_run],
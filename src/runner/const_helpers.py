@@ -1,3 +1,6 @@
+import re
+import configparser
+
 def csv2list(csv_str):
     """csv2list
     Converts a string of comma-separated values into a Python list of strs,
@@ -7,3 +10,51 @@ def csv2list(csv_str):
     :param csv_str: String of comma-separated values
     """
     return list(filter(lambda s: s != '', map(str.strip, csv_str.split(','))))
+
+def str2bool(bool_str):
+    """str2bool
+    Converts a boolean-like string to a Python bool, accepting the same values
+    as ConfigParser.getboolean (1/0, yes/no, true/false, on/off).
+    Raises ValueError for any other string.
+
+    :param bool_str: String to be converted
+    """
+    try:
+        return configparser.ConfigParser.BOOLEAN_STATES[bool_str.lower()]
+    except KeyError:
+        raise ValueError("Not a boolean: %s" % bool_str)
+
+def combine_regexps(regexps):
+    """combine_regexps
+    Fuses a dict of name -> compiled regex into a single compiled alternation,
+    wrapping each regex in a group named after its key. That group is then
+    directly followed by the regex's own (value) group.
+    Raises ValueError for regexes with flags, or without exactly one group,
+    since neither would survive being fused.
+
+    :param regexps: Dict mapping group names to compiled regexes
+    """
+    default_flags = re.compile('').flags
+    for k, regex in regexps.items():
+        if regex.flags != default_flags:
+            raise ValueError("Regex for '%s' must not use flags; " % k +
+                "use inline flags like (?i:...) in the pattern instead")
+        if regex.groups != 1:
+            raise ValueError("Regex for '%s' must have exactly one " % k +
+                "capturing group (the value), but has %i" % regex.groups)
+    return re.compile('|'.join("(?P<{}>{})".format(k, regex.pattern)
+        for k, regex in regexps.items()))
+
+def group_table(regex, types):
+    """group_table
+    Returns a list indexed by group number in the given regex (as combined by
+    combine_regexps), holding (name, value group index, type) at the index of
+    each named group, and None everywhere else.
+
+    :param regex: Compiled regex from combine_regexps
+    :param types: Dict mapping each group name to the type of its value
+    """
+    table = [None] * (regex.groups + 1)
+    for name, index in regex.groupindex.items():
+        table[index] = (name, index + 1, types[name])
+    return table
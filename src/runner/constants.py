@@ -127,6 +127,8 @@ CLEAN_COMMANDS = {
 # plotfields    =   fields to include in the output plot
 # exportfields  =   fields to include in the raw data output (e.g. CSV cols)
 # clean_data    =   whether or not the DBMS data should be wiped prior to each YCSB run
+# parallel_dbs  =   whether this DBMS may be run concurrently with other DBMSes
+#                   that also set parallel_dbs (only if they don't share a server)
 OPTION_KEYS = {
     'trials'       : int,
     'min_mpl'      : int,
@@ -142,8 +144,12 @@ OPTION_KEYS = {
     'plotfields'   : helpers.csv2list,
     'exportfields' : helpers.csv2list,
     'clean_data'   : bool,
+    'parallel_dbs' : bool,
 }
 
+# The names of all option keys, for finding extraneous (workload) options
+OPTION_KEY_SET = frozenset(OPTION_KEYS)
+
 # Specifies default values for options in the Runner configuration file
 OPTION_DEFAULTS = {
     'trials'       : 1,
@@ -159,13 +165,15 @@ OPTION_DEFAULTS = {
     'plotfields'   : 'anomaly_score',
     'exportfields' : 'mpl,runtime,throughput,trial',
     'clean_data'   : 'true',
+    'parallel_dbs' : 'false',
 }
 ####################################################################
 
 ### STATS COLLECTION: ##############################################
 
 # Regex precompilation for statistics extraction
-# The first match group is extracted for each statistic
+# Each regex must have exactly one capturing group, which is extracted for
+# its statistic, and no flags (these are fused into STAT_COMBINED below)
 # The keys in this dict should match to keys in TRACKED_STATS
 STAT_REGEXPS = {
     'totalcash'      : re.compile(r"TOTAL CASH], ([0-9]+)"),
@@ -190,9 +198,37 @@ TRACKED_STATS = {
     'trial'          : int  , # Trial number
 }
 
+# All of STAT_REGEXPS fused into one alternation, so YCSB output only needs to
+# be scanned once. Each regex is wrapped in a group named after its key; the
+# regex's own group (the value) directly follows that named group.
+STAT_COMBINED = helpers.combine_regexps(STAT_REGEXPS)
+
+# (key, value group index, type) for each stat, indexed by the number of its
+# named group in STAT_COMBINED (i.e. by match.lastindex); other slots are None
+STAT_GROUPS = helpers.group_table(STAT_COMBINED, TRACKED_STATS)
+
 ####################################################################
 
 ### OUTPUT LOGGING: ################################################
 
 LOG_LINE_PREFIX = "<<YCSB Runner>>: %s"
 ####################################################################
+
+### HOOKS: #########################################################
+
+# Locations at which user hooks may be run (see hooks.example.py)
+HOOK_LOCATIONS = (
+    'PRE_RUN',
+    'PRE_DB',
+    'PRE_TRIAL',
+    'PRE_MPL',
+    'POST_MPL',
+    'POST_TRIAL',
+    'POST_DB',
+    'POST_RUN',
+)
+
+# Indexes into HOOK_LOCATIONS, used by the runner to dispatch hooks
+(HOOK_PRE_RUN, HOOK_PRE_DB, HOOK_PRE_TRIAL, HOOK_PRE_MPL, HOOK_POST_MPL,
+    HOOK_POST_TRIAL, HOOK_POST_DB, HOOK_POST_RUN) = range(len(HOOK_LOCATIONS))
+####################################################################
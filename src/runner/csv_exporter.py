@@ -1,3 +1,5 @@
+import os
+import csv
 import collections
 import pandas as pd
 
@@ -18,9 +20,22 @@ class CsvExporter(Exporter):
     """
     def export(self, filename, key, *fields):
         filename = filename + self.FILE_EXT
-        # Export to CSV without indexes
-        DataFrame(self.stats_set.getfields(*fields)).to_csv(filename,
-                index=False)
+        # Export to CSV without indexes, keeping the column order of fields
+        #   so that rows written by append() line up with the header
+        DataFrame(self.stats_set.getfields(*fields),
+                columns=list(fields)).to_csv(filename, index=False)
+
+    def append(self, filename, stats, *fields):
+        filename = filename + self.FILE_EXT
+        with open(filename, 'a', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            # Only a new file needs a header
+            if f.tell() == 0:
+                writer.writeheader()
+            writer.writerow(stats.dict(*fields))
+            # Make sure the row is on disk in case the run dies
+            f.flush()
+            os.fsync(f.fileno())
 
     def export_averages(self, filename, key, *fields):
         filename = filename + self.FILE_EXT
@@ -258,6 +258,17 @@ class DbSystem:
                 self.labelname, self.__datestr),
                     self.plotkey, *self.plotfields)
 
+    def append_stats_row(self, stats):
+        """append_stats_row
+        Adds the given Statistics row to this DB's stats, and appends it to
+        the raw data output without rewriting previously exported rows
+
+        :param stats: Statistics instance to be added
+        """
+        self.stats.addstats(stats)
+        exporter = const.SUPPORTED_OUTPUTS[self.output](self.stats)
+        exporter.append(self.makefpath("output-{}-{}"), stats, *self.exportfields)
+
     @property
     def workload_path(self):
         """workload_path
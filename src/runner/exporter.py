@@ -21,6 +21,17 @@ class Exporter:
         """
         raise NotImplementedError
 
+    def append(self, filename, stats, *fields):
+        """append
+        Appends a single row to the given export file, as written by export(),
+          without rewriting the rows already in it.
+
+        :param filename: Filename and path for the export output
+        :param stats: Statistics object to be appended
+        :param *fields: Fields to be exported
+        """
+        raise NotImplementedError
+
     def export_averages(self, filename, key, *fields):
         """export_averages
         Exports the averages of the given fields, grouped by the given key, to
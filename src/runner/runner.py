@@ -1,12 +1,14 @@
 import os
 import sys
+import threading
 import subprocess
 import configparser
 
-from shutil    import copyfile
-from itertools import count
+from shutil             import copyfile, which
+from concurrent.futures import ThreadPoolExecutor
 
 from .         import constants as const
+from .         import const_helpers as helpers
 from .stats    import Statistics
 from .dbsystem import DbSystem
 
@@ -23,59 +25,146 @@ class Runner:
         if not os.path.exists(configpath):
             raise IOError("Runner config file '%s' does not exist" % configpath)
         # Read the runner config with Python's ConfigParser first
-        self.__config = configparser.ConfigParser(defaults=const.OPTION_DEFAULTS)
-        self.__config.read(configpath)
+        config = configparser.ConfigParser(defaults=const.OPTION_DEFAULTS)
+        config.read(configpath)
+        # Take a plain dict snapshot of each section (defaults and
+        #   interpolation applied) so the parser needn't be kept around
+        self.__sections = {name: dict(config[name]) for name in config.sections()}
         # Now, process the config further, extracting DBMS names, options
         self.dbs = self.__process_sections()
         # Load hooks
-        self.__hooks = {} if hooks is None else hooks
+        self.__hooks = self.__process_hooks({} if hooks is None else hooks)
         # We need this in order to copy the file across to the output dir
         self.__configpath = configpath
+        # Cache of command names -> absolute executable paths (see __spawn_cmd)
+        self.__executables = {}
+        # Maps source paths -> first output copy (see __copy_to_output)
+        self.__copied = {}
+        # Serialises stats exports between DBs running in parallel
+        self.__export_lock = threading.Lock()
 
     def run(self):
-        self.__run_hooks("PRE_RUN")
+        self.__run_hooks(const.HOOK_PRE_RUN)
+        # DBMSes configured with parallel_dbs are run concurrently with each
+        #   other; all others are run one at a time afterwards
+        parallel_dbs = [db for db in self.dbs if db.parallel_dbs]
+        if parallel_dbs:
+            workers = min(len(parallel_dbs), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(self.__run_db, db) for db in parallel_dbs]
+                # Re-raise any exception from a worker here
+                for future in futures:
+                    future.result()
         for db in self.dbs:
-            self.__run_hooks("PRE_DB", db)
-            # Copy config files to output dir
-            copyfile(self.__configpath, db.makefpath("config-{}-{}.ini"))
-            # Copy the raw workload and generated workload to output for
-            # reference. This is useful because the generated workload file
-            # doesn't include original comments, for exmaple.
-            copyfile(db.base_workload_path, db.makefpath("workload-{}-{}"))
-            db.generate_workload_file(db.makefpath("workload-generated-{}-{}"))
-            for trial in range(1, db.trials + 1):
-                self.__run_hooks("PRE_TRIAL", trial, db)
-                db.log("Starting trial %i..." % (trial), trial=trial)
-                for mpl in count(start=db.min_mpl, step=db.inc_mpl):
-                    self.__run_hooks("PRE_MPL", mpl, trial, db)
-                    # Obvious; don't go above configured maximum MPL
-                    if mpl > db.max_mpl:
-                        break
-                    # Clean the database
-                    db.log("Cleaning the database...", mpl=mpl, trial=trial)
-                    if db.clean_data:
-                        db.clean()
-                    # Load data and run YCSB
-                    db.log("Loading YCSB data...", mpl=mpl, trial=trial)
-                    if db.clean_data:
-                        db.raw_log(self.__popen(db.cmd_ycsb_load()))
-                    db.log("Running YCSB workload...", mpl=mpl, trial=trial)
-                    # Run YCSB+T, log output, collect stats
-                    stats = Runner.extract_stats(db.raw_log(self.__popen(db.cmd_ycsb_run(mpl))))
-                    # Set the MPL and trial number in the stats row
-                    stats.mpl = mpl
-                    stats.trial = trial
-                    db.stats.addstats(stats)
-                    self.__run_hooks("POST_MPL", mpl, trial, db)
-                    # Export run stats repeatedly for maximum durability
-                    db.log("Exporting run stats...")
+            if not db.parallel_dbs:
+                self.__run_db(db)
+        self.__run_hooks(const.HOOK_POST_RUN)
+
+    def __run_db(self, db):
+        """__run_db
+        Runs a single DBMS: writes its config and workload files to the output
+        dir, then runs all of its trials
+
+        :param db: DbSystem instance to be run
+        """
+        self.__run_hooks(const.HOOK_PRE_DB, db)
+        # Write the output copies in the background; nothing reads them, so
+        #   they can overlap with cleaning the DB and loading YCSB data. Paths
+        #   are built here so only this thread creates the output dir.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            output_copies = [
+                # Copy config files to output dir
+                executor.submit(self.__copy_to_output, self.__configpath,
+                    db.makefpath("config-{}-{}.ini")),
+                # Copy the raw workload and generated workload to output for
+                # reference. This is useful because the generated workload file
+                # doesn't include original comments, for exmaple.
+                executor.submit(self.__copy_to_output, db.base_workload_path,
+                    db.makefpath("workload-{}-{}")),
+                executor.submit(db.generate_workload_file,
+                    db.makefpath("workload-generated-{}-{}")),
+            ]
+            self.__run_trials(db, output_copies)
+        # Re-raise any error from the output copies (e.g. if no trials ran)
+        Runner.__wait(output_copies)
+        db.cleanup() # ensure file handles are closed properly and don't leak
+        self.__run_hooks(const.HOOK_POST_DB, db)
+
+    def __run_trials(self, db, output_copies):
+        """__run_trials
+        Runs all trials and MPLs for a single DBMS
+
+        :param db: DbSystem instance to be run
+        :param output_copies: Futures for files being written to the output
+            dir, which must complete before YCSB is first run
+        """
+        for trial in range(1, db.trials + 1):
+            self.__run_hooks(const.HOOK_PRE_TRIAL, trial, db)
+            db.log("Starting trial %i..." % (trial), trial=trial)
+            for mpl in range(db.min_mpl, db.max_mpl + 1, db.inc_mpl):
+                self.__run_hooks(const.HOOK_PRE_MPL, mpl, trial, db)
+                # Clean the database
+                db.log("Cleaning the database...", mpl=mpl, trial=trial)
+                if db.clean_data:
+                    db.clean()
+                # Load data and run YCSB
+                db.log("Loading YCSB data...", mpl=mpl, trial=trial)
+                if db.clean_data:
+                    # Load output isn't parsed, so send it straight to the log
+                    self.__popen_to_file(db.cmd_ycsb_load(), db.logfile)
+                db.log("Running YCSB workload...", mpl=mpl, trial=trial)
+                # The output copies only need to be done by the first run
+                Runner.__wait(output_copies)
+                # Run YCSB+T, log output, collect stats
+                stats = Runner.extract_stats(self.__popen(db.cmd_ycsb_run(mpl), db.raw_log))
+                # Set the MPL and trial number in the stats row
+                stats.mpl = mpl
+                stats.trial = trial
+                # Append each row to the raw output as we go for durability
+                db.append_stats_row(stats)
+                self.__run_hooks(const.HOOK_POST_MPL, mpl, trial, db)
+            # Export all run stats, averages and plots after each trial (if
+            #   there are any, e.g. min_mpl may be above max_mpl)
+            if len(db.stats) > 0:
+                db.log("Exporting run stats...", trial=trial)
+                # matplotlib's pyplot state is global, so only one DB may
+                #   export at a time when running in parallel
+                with self.__export_lock:
                     db.export_stats()
-                self.__run_hooks("POST_TRIAL", trial, db)
-            db.cleanup() # ensure file handles are closed properly and don't leak
-            self.__run_hooks("POST_DB", db)
-        self.__run_hooks("POST_RUN")
+            self.__run_hooks(const.HOOK_POST_TRIAL, trial, db)
 
-    def __popen(self, cmd):
+    @staticmethod
+    def __wait(futures):
+        """__wait
+        Waits for each of the given futures, re-raising any exception, and
+        removes them from the list so later calls return immediately
+
+        :param futures: List of concurrent.futures.Future instances
+        """
+        while futures:
+            futures.pop().result()
+
+    def __copy_to_output(self, src, dst):
+        """__copy_to_output
+        Copies src to dst. The first copy of each source file is remembered,
+        and later copies of the same source are hard links to it (falling
+        back to a real copy if linking fails, e.g. across filesystems).
+
+        :param src: Path to the source file
+        :param dst: Path to the destination file in an output directory
+        """
+        src = os.path.abspath(src)
+        if src in self.__copied:
+            try:
+                os.link(self.__copied[src], dst)
+                return
+            except OSError:
+                pass
+        copyfile(src, dst)
+        # Link later copies to this one (replacing any copy we failed to link)
+        self.__copied[src] = dst
+
+    def __popen(self, cmd, log=None):
         """__popen
         Open a process given by the list of shell arguments, cmd
 
@@ -83,14 +172,54 @@ class Runner:
 
         :param cmd: List of shell arguments, including name of command as
         first element
+        :param log: Optional function (e.g. DbSystem.raw_log) called with each
+        line of stdout, without its newline, as soon as the line arrives
+        """
+        with subprocess.Popen(self.__spawn_cmd(cmd), stdout=subprocess.PIPE,
+                encoding="utf-8", close_fds=False) as proc:
+            # Log output while the process runs, instead of only after it
+            #   has exited
+            lines = []
+            for line in proc.stdout:
+                if log is not None:
+                    log(line.rstrip("\n"))
+                lines.append(line)
+            return "".join(lines)
+
+    def __popen_to_file(self, cmd, f):
+        """__popen_to_file
+        Run the process given by the list of shell arguments, cmd, writing its
+        stdout directly to the given file rather than through a pipe
+
+        Returns the exit code of the process
+
+        :param cmd: List of shell arguments, including name of command as
+        first element
+        :param f: Open file object to which stdout should be written
         """
-        with subprocess.Popen(cmd, stdout=subprocess.PIPE) as proc:
-            # Collect and return stdout after running process
-            stdout = proc.stdout.read().decode("utf-8")
-            # If this doesn't hold then something is horribly wrong and we
-            #   should abort mission
-            assert type(stdout) is str
-            return stdout
+        # Anything we've buffered must reach the file before the process'
+        #   output does
+        f.flush()
+        return subprocess.call(self.__spawn_cmd(cmd), stdout=f, close_fds=False)
+
+    def __spawn_cmd(self, cmd):
+        """__spawn_cmd
+        Returns cmd with its executable resolved to an absolute path.
+
+        CPython only starts processes with posix_spawn (rather than fork+exec)
+        when the executable has a directory component and close_fds is False.
+        Callers pass close_fds=False, which is fine for files the runner opens
+        itself since Python's fds are not inheritable by default (PEP 446).
+        However, any inheritable fds the runner was given by its own parent
+        process will also be inherited by each YCSB process.
+
+        :param cmd: List of shell arguments, including name of command as
+        first element
+        """
+        executable = cmd[0]
+        if executable not in self.__executables:
+            self.__executables[executable] = which(executable) or executable
+        return [self.__executables[executable]] + cmd[1:]
 
     def __process_sections(self):
         """__process_sections
@@ -98,7 +227,7 @@ class Runner:
         populating this object with corresponding DbSystem instances
         """
         dbs = []
-        for section in self.__config.sections():
+        for section in self.__sections:
             config = self.__process_runner_config_keys(section)
             dbs += self.__process_dbs(section, config)
         return dbs
@@ -108,20 +237,23 @@ class Runner:
         :param section: Name of section from runner config file for which
         k=v options should be processed
         """
+        values = self.__sections[section]
         config = {}
         for k, t in const.OPTION_KEYS.items():
+            # Options without a default must be set in the section itself
+            if k not in values:
+                raise configparser.NoOptionError(k, section)
             # Handle integer-valued keys
             if t is int:
-                config[k] = self.__config.getint(section, k)
+                config[k] = int(values[k])
             # Handle boolean-valued keys
             elif t is bool:
-                print("getting bool", k)
-                config[k] = self.__config.getboolean(section, k)
+                config[k] = helpers.str2bool(values[k])
             # Handle string-valued keys
             elif t is str:
-                config[k] = self.__config.get(section, k)
+                config[k] = values[k]
             elif callable(t):
-                config[k] = t(self.__config.get(section, k))
+                config[k] = t(values[k])
             else:
                 print("Warning: skipping key %s with invalid type" % k)
         return config
@@ -132,13 +264,11 @@ class Runner:
         specified config section which aren't contained in the
         const.OPTION_KEYS dict
 
-        :param config_section: An object corresponding to one section from a
-        configparser object
+        :param config_section: A dict of key -> value mappings for one section
+        of the runner config
         """
-        config_keys = set(config_section.keys())
-        option_keys = set(const.OPTION_KEYS.keys())
-        extraneous_keys = list(config_keys - option_keys)
-        return {k: config_section.get(k) for k in extraneous_keys}
+        return {k: config_section[k]
+                for k in config_section.keys() - const.OPTION_KEY_SET}
 
     def __process_dbs(self, section, config):
         """__process_dbs
@@ -150,26 +280,30 @@ class Runner:
             sections (e.g. output of __process_runner_config_keys)
         """
         # Find extraneous config pairs
-        extraneous_config = self.__extraneous_config(self.__config[section])
+        extraneous_config = self.__extraneous_config(self.__sections[section])
         # Section headings may contain multiple DB names, CSV format
         section = [s.strip() for s in section.split(',')]
         db_instances = []
+        search_label = const.RE_DBNAME_LABEL.search
+        strip_label  = const.RE_DBNAME_LABEL.sub
         for dbname in section:
             # Extract and remove the DBMS label
-            label = const.RE_DBNAME_LABEL.search(dbname)
+            label = search_label(dbname)
             if label is not None:
                 label, = label.groups(0)
-                dbname = const.RE_DBNAME_LABEL.sub("", dbname)
+                dbname = strip_label("", dbname)
             else:
                 label = ""
             # Validate DBMS name
-            if dbname.lower() not in const.SUPPORTED_DBS:
+            dbname_lower = dbname.lower()
+            if dbname_lower not in const.SUPPORTED_DBS:
                 print("Invalid database found: %s. Only (%s) are supported. Skipping..." %
                         (dbname, ','.join(const.SUPPORTED_DBS)))
                 continue
 
-            # Build the DbSystem object
-            db_instances.append(DbSystem(dbname, config, label=label,
+            # Build the DbSystem object. DbSystem looks the name up in
+            #   SUPPORTED_DBS and CLEAN_COMMANDS, so it must be lower case.
+            db_instances.append(DbSystem(dbname_lower, config, label=label,
                 extraneous_config=extraneous_config))
         return db_instances
 
@@ -182,15 +316,21 @@ class Runner:
         take place
         """
         stats = {}
-        for k, regex in const.STAT_REGEXPS.items():
-            m = Runner.get_re_match(regex, stdout)
-            if m is not None:
-                stats[k] = const.TRACKED_STATS[k](m)
+        groups = const.STAT_GROUPS
+        nstats = len(const.STAT_REGEXPS)
+        # Single pass over the output; the first match of each stat wins
+        for m in const.STAT_COMBINED.finditer(stdout):
+            k, group, extractor = groups[m.lastindex]
+            if k not in stats:
+                stats[k] = extractor(m.group(group))
+                # Stop scanning once every stat has been found
+                if len(stats) == nstats:
+                    break
         # Return new Statistics row storing extracted stats
-        return Statistics(**stats)
+        return Statistics(stats)
 
-    @classmethod
-    def get_re_match(cls, regex, string):
+    @staticmethod
+    def get_re_match(regex, string):
         """get_re_match
         Returns the contents of the first capturing group after running
         regex.search on the given string, or None if no matches found
@@ -199,18 +339,34 @@ class Runner:
         :param string: String on which to run regex
         """
         res = regex.search(string)
-        if res != None and len(res.groups()) > 0:
-            return res.group(1)
-        return None
+        if res is None:
+            return None
+        groups = res.groups()
+        return groups[0] if groups else None
+
+    def __process_hooks(self, hooks):
+        """__process_hooks
+        Returns a list holding the list of hook functions for each location in
+        const.HOOK_LOCATIONS, in the same order
+
+        :param hooks: A dictionary mapping hook names to lists of functions.
+        """
+        hooks_by_id = [[] for location in const.HOOK_LOCATIONS]
+        for location, functions in hooks.items():
+            location = location.upper()
+            if location not in const.HOOK_LOCATIONS:
+                print("Warning: skipping hooks for unknown location %s" % location)
+                continue
+            hooks_by_id[const.HOOK_LOCATIONS.index(location)] += functions
+        return hooks_by_id
 
     def __run_hooks(self, location, *args):
         """__run_hooks
         Runs all hooks for the given hook location, passing in the given args.
 
-        :param location: Location name for the hooks to run.
+        :param location: Index of the hook location in const.HOOK_LOCATIONS
+            (one of the const.HOOK_* values).
         :param *args: Arguments to pass to each hook function.
         """
-        location = location.upper()
-        if location in self.__hooks:
-            for h in self.__hooks[location]:
-                h(*args)
+        for h in self.__hooks[location]:
+            h(*args)
@@ -5,10 +5,20 @@ from . import constants as const
 class Statistics:
     """Statistics: Stores statistical data for a single run of YCSB"""
 
-    # Handle importing stats from kwargs
-    def __init__(self, **kwargs):
+    # Stats live in the __stats dict, so instances don't need a __dict__ too
+    __slots__ = ('__stats',)
+
+    # Handle importing stats from a dict and/or kwargs
+    def __init__(self, stats=None, **kwargs):
+        """__init__
+
+        :param stats: Optional dict mapping stat names to values
+        :param **kwargs: Stat values given by name (override those in stats)
+        """
         self.__stats = {}
-        # Import values from given keyword arguments
+        if stats is not None:
+            kwargs = dict(stats, **kwargs)
+        # Import values from given stats and keyword arguments
         for k, v in kwargs.items():
             if k not in const.TRACKED_STATS:
                 raise AttributeError("Unexpected keyword argument: '%s'. " % k +
@@ -46,7 +56,6 @@ class Statistics:
 
     def __dir__(self):
         objdir = list(dir(super(Statistics, self)))
-        objdir += list(self.__dict__.keys())
         objdir +=  list(self.__stats.keys())
         return objdir
 
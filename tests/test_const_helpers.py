@@ -0,0 +1,49 @@
+import re
+import unittest
+
+from .helpers import *
+
+from runner import const_helpers as helpers
+
+class ConstHelpersTestCase(unittest.TestCase):
+    def test_csv2list(self):
+        self.assertEqual(helpers.csv2list(" foo, bar,,baz "), ['foo', 'bar', 'baz'])
+        self.assertEqual(helpers.csv2list(""), [])
+
+    def test_str2bool(self):
+        for s in ('1', 'yes', 'true', 'on'):
+            self.assertIs(helpers.str2bool(s), True)
+            self.assertIs(helpers.str2bool(s.upper()), True)
+        for s in ('0', 'no', 'false', 'off'):
+            self.assertIs(helpers.str2bool(s), False)
+            self.assertIs(helpers.str2bool(s.upper()), False)
+        self.assertIs(helpers.str2bool('True'), True)
+        self.assertIs(helpers.str2bool('oFf'), False)
+        for s in ('', 'y', 'n', '2', 'truee', ' true'):
+            with self.assertRaises(ValueError):
+                helpers.str2bool(s)
+
+    def test_combine_regexps(self):
+        combined = helpers.combine_regexps({
+            'foo': re.compile(r"foo=([0-9]+)"),
+            'bar': re.compile(r"bar=([a-z]+)"),
+        })
+        self.assertEqual([(m.lastgroup, m.group(m.lastindex + 1))
+            for m in combined.finditer("bar=x foo=1 foo=2")],
+            [('bar', 'x'), ('foo', '1'), ('foo', '2')])
+        # Flags would be lost when fusing
+        with self.assertRaises(ValueError):
+            helpers.combine_regexps({'foo': re.compile(r"foo=([0-9]+)", re.I)})
+        # The value must be the only group
+        with self.assertRaises(ValueError):
+            helpers.combine_regexps({'foo': re.compile(r"foo=[0-9]+")})
+        with self.assertRaises(ValueError):
+            helpers.combine_regexps({'foo': re.compile(r"(foo)=([0-9]+)")})
+
+    def test_group_table(self):
+        combined = helpers.combine_regexps({
+            'foo': re.compile(r"foo=([0-9]+)"),
+            'bar': re.compile(r"bar=([0-9.]+)"),
+        })
+        self.assertEqual(helpers.group_table(combined, {'foo': int, 'bar': float}),
+            [None, ('foo', 2, int), None, ('bar', 4, float), None])
@@ -135,6 +135,15 @@ class DbSystemTestCase(unittest.TestCase):
         self.db.export_stats()
         self.assertTrue(len(os.listdir(self.db.outdirpath)) == 3)
 
+    def test_append_stats_row(self):
+        self.db.append_stats_row(Statistics(mpl=1, runtime=3.))
+        self.db.append_stats_row(Statistics(mpl=2, runtime=6.))
+        self.assertEqual(len(self.db.stats), 2)
+        self.assertTrue(len(os.listdir(self.db.outdirpath)) == 1)
+        fname, = os.listdir(self.db.outdirpath)
+        with open(os.path.join(self.db.outdirpath, fname)) as f:
+            self.assertEqual(f.read().splitlines(), ['runtime', '3.0', '6.0'])
+
     def test_workload_path(self):
         # Ensure workload file exists
         self.assertTrue(os.path.exists(self.db.workload_path))
@@ -21,6 +21,8 @@ class ExporterTestCase(unittest.TestCase):
     def test_export_methods(self):
         with self.assertRaises(NotImplementedError):
             self.exp.export('foobar', 'foobar', 'foobar')
+        with self.assertRaises(NotImplementedError):
+            self.exp.append('foobar', Statistics(), 'foobar')
         with self.assertRaises(NotImplementedError):
             self.exp.export_averages('foobar', 'foobar', 'foobar')
         with self.assertRaises(NotImplementedError):
@@ -43,6 +45,18 @@ class CsvExporterTestCase(unittest.TestCase):
             self.assertTrue(os.path.exists(fname + CsvExporter.FILE_EXT))
             self.assertTrue(os.stat(fname + CsvExporter.FILE_EXT).st_size > 0)
 
+    def test_append(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            fname = os.path.join(tmpdirname, 'export')
+            self.exp.export(fname, self.statkey1, self.statkey1, self.statkey2)
+            self.exp.append(fname, Statistics(), self.statkey1, self.statkey2)
+            with open(fname + CsvExporter.FILE_EXT) as f:
+                lines = f.read().splitlines()
+            # Header, two exported rows and the appended row
+            self.assertEqual(len(lines), 4)
+            self.assertEqual(lines[0], "{},{}".format(self.statkey1, self.statkey2))
+            self.assertEqual(lines[-1], lines[1])
+
     def test_export_averages(self):
         with tempfile.TemporaryDirectory() as tmpdirname:
             fname = os.path.join(tmpdirname, 'averages')
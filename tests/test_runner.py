@@ -1,28 +1,371 @@
+import io
+import os
+import re
+import tempfile
 import unittest
+import contextlib
+import configparser
+from unittest import mock
+from time import sleep
 
 from .helpers import *
 
 import runner.constants as const
 from runner.runner import Runner
 
+YCSB_OUTPUT = """
+[OVERALL], RunTime(ms), 5012.0
+[OVERALL], Throughput(ops/sec), 19952.11
+[TX-READMODIFYWRITE], Operations, 49885
+[TX-READMODIFYWRITE], AverageLatency(us), 1283.42
+[TX-READMODIFYWRITE], AverageLatency(us), 9999.99
+[TOTAL CASH], 10000000
+[COUNTED CASH], 9999870
+[ACTUAL OPERATIONS], 100000
+"""
+
+RUNNER_CONFIG = """
+[DEFAULT]
+trials       = 2
+workload     = foo
+output_plots = off
+
+[redis, mongodb:bar]
+max_mpl = 8
+recordcount = 500
+
+[jdbc-postgres]
+clean_data = no
+"""
+
+FOO_WORKLOAD = """
+recordcount=10000
+operationcount=100000
+"""
+
+# Two DBMSes run in parallel, then one serially
+RUN_CONFIG = """
+[DEFAULT]
+trials       = 2
+min_mpl      = 1
+max_mpl      = 5
+inc_mpl      = 4
+workload     = foo
+output_plots = off
+exportfields = mpl,throughput,trial
+
+[redis, mongodb]
+parallel_dbs = on
+
+[jdbc-postgres]
+"""
+
+# Fake YCSB: records each call in ./calls, and reports the thread count as
+# the throughput so each output row can be told apart
+FAKE_YCSB = """#!/bin/sh
+echo "$1 $2 $7" >> calls
+if [ "$1" = load ]; then
+    echo "LOAD OUTPUT $2"
+else
+    echo "[OVERALL], RunTime(ms), 100"
+    echo "[OVERALL], Throughput(ops/sec), $7"
+fi
+"""
+
+# The clean commands for the DBMSes in RUN_CONFIG
+CLEAN_COMMANDS = ('redis-cli', 'mongo', 'psql')
+
 class RunnerTestCase(unittest.TestCase):
     def setUp(self):
-        pass
+        # Set the working directory to some temp dir
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.__real_cwd = os.getcwd()
+        os.chdir(self.tempdir.name)
+        # Write fake workload and runner config
+        with open('foo', 'w') as wf:
+            wf.write(FOO_WORKLOAD)
+        with open('config.ini', 'w') as cf:
+            cf.write(RUNNER_CONFIG)
+        with open('run.ini', 'w') as cf:
+            cf.write(RUN_CONFIG)
+        self.runner = Runner('config.ini')
+        # Put fake YCSB and DBMS clean commands first on the PATH
+        self.bindir = os.path.join(self.tempdir.name, 'bin')
+        os.mkdir(self.bindir)
+        self.write_script('ycsb', FAKE_YCSB)
+        for cmd in CLEAN_COMMANDS:
+            self.write_script(cmd, "#!/bin/sh\nexit 0\n")
+        self.__real_path = os.environ['PATH']
+        os.environ['PATH'] = self.bindir + os.pathsep + self.__real_path
 
     def tearDown(self):
-        pass
+        for db in self.runner.dbs:
+            db.cleanup()
+        os.environ['PATH'] = self.__real_path
+        self.tempdir.cleanup()
+        # Change CWD back to real CWD
+        os.chdir(self.__real_cwd)
+
+    def write_script(self, name, contents):
+        path = os.path.join(self.bindir, name)
+        with open(path, 'w') as f:
+            f.write(contents)
+        os.chmod(path, 0o755)
+
+    def run_runner(self, configpath, hooks=None):
+        """run_runner
+        Runs a Runner for the given config with stdout silenced, returning the
+        Runner and a list of (location, *args) for every hook called
+        """
+        calls = []
+        if hooks is None:
+            hooks = {}
+        for location in const.HOOK_LOCATIONS:
+            hooks.setdefault(location, []).append(
+                lambda *args, location=location: calls.append((location,) +
+                    tuple(a.labelname if hasattr(a, 'labelname') else a for a in args)))
+        runner = Runner(configpath, hooks=hooks)
+        self.addCleanup(lambda: [db.cleanup() for db in runner.dbs])
+        with contextlib.redirect_stdout(io.StringIO()):
+            runner.run()
+        return runner, calls
+
+    def read_output(self, db):
+        with open(db.makefpath("output-{}-{}") + ".csv") as f:
+            return f.read().splitlines()
 
     def test_init(self):
-        pass
+        dbs = {db.labelname: db for db in self.runner.dbs}
+        self.assertEqual(sorted(dbs), ['jdbc-postgres', 'mongodb:bar', 'redis'])
+        for db in dbs.values():
+            # Values from [DEFAULT]
+            self.assertEqual(db.trials, 2)
+            self.assertEqual(db.workload, 'foo')
+            self.assertIs(db.output_plots, False)
+            # Values from const.OPTION_DEFAULTS
+            self.assertEqual(db.min_mpl, 1)
+            self.assertEqual(db.inc_mpl, 4)
+            self.assertEqual(db.output, 'csv')
+            self.assertEqual(db.avgfields, ['anomaly_score', 'runtime'])
+            self.assertIs(db.parallel_dbs, False)
+        # Per-section values
+        self.assertEqual(dbs['redis'].max_mpl, 8)
+        self.assertEqual(dbs['mongodb:bar'].max_mpl, 8)
+        self.assertEqual(dbs['jdbc-postgres'].max_mpl, 25)
+        self.assertIs(dbs['redis'].config['clean_data'], True)
+        self.assertIs(dbs['jdbc-postgres'].config['clean_data'], False)
+        # Extra keys are passed through to the workload, options are not
+        self.assertEqual(dbs['redis'].workload_config['recordcount'], '500')
+        self.assertEqual(dbs['jdbc-postgres'].workload_config['recordcount'], '10000')
+        self.assertEqual(dbs['jdbc-postgres'].workload_config['operationcount'], '100000')
+        for k in const.OPTION_KEYS:
+            self.assertNotIn(k, dbs['redis'].workload_config)
+
+    def test_init_dbname_case(self):
+        with open('case.ini', 'w') as cf:
+            cf.write("[Redis:Foo]\nworkload = foo\n")
+        runner = Runner('case.ini')
+        self.addCleanup(lambda: [db.cleanup() for db in runner.dbs])
+        db, = runner.dbs
+        self.assertEqual(db.dbname, 'redis')
+        self.assertEqual(db.label, ':Foo')
+        self.assertIn('redis', db.cmd_ycsb_run(1))
+
+    def test_init_missing_option(self):
+        with open('missing.ini', 'w') as cf:
+            cf.write("[redis]\ntrials = 1\n")
+        with self.assertRaises(configparser.NoOptionError) as cm:
+            Runner('missing.ini')
+        self.assertEqual(cm.exception.option, 'workload')
+        self.assertEqual(cm.exception.section, 'redis')
+
+    def test_hooks(self):
+        hooks = {
+            'pre_run' : [len],
+            'PRE_RUN' : [str],
+            'Post_Db' : [repr],
+            'bogus'   : [abs],
+        }
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            runner = Runner('config.ini', hooks=hooks)
+        for db in runner.dbs:
+            db.cleanup()
+        table = runner._Runner__hooks
+        self.assertEqual(len(table), len(const.HOOK_LOCATIONS))
+        # Keys of any case are merged into the upper-case location
+        self.assertEqual(table[const.HOOK_PRE_RUN], [len, str])
+        self.assertEqual(table[const.HOOK_POST_DB], [repr])
+        # Unknown locations are dropped with a warning
+        for i, location in enumerate(const.HOOK_LOCATIONS):
+            self.assertNotIn(abs, table[i])
+            if i not in (const.HOOK_PRE_RUN, const.HOOK_POST_DB):
+                self.assertEqual(table[i], [], location)
+        self.assertIn("unknown location BOGUS", out.getvalue())
+        # Hooks are run for their location with the given args
+        calls = []
+        runner = Runner('config.ini', hooks={'pre_mpl': [lambda *a: calls.append(a)]})
+        for db in runner.dbs:
+            db.cleanup()
+        runner._Runner__run_hooks(const.HOOK_PRE_MPL, 1, 2, 'db')
+        runner._Runner__run_hooks(const.HOOK_POST_MPL, 3, 4, 'db')
+        self.assertEqual(calls, [(1, 2, 'db')])
+
+    def test_spawn_cmd(self):
+        spawn_cmd = self.runner._Runner__spawn_cmd
+        ycsb = os.path.join(self.bindir, 'ycsb')
+        self.assertEqual(spawn_cmd(['ycsb', 'run', 'redis']), [ycsb, 'run', 'redis'])
+        self.assertEqual(self.runner._Runner__executables, {'ycsb': ycsb})
+        # Resolved paths are cached, so PATH isn't searched again
+        os.environ['PATH'] = ''
+        self.assertEqual(spawn_cmd(['ycsb', 'load']), [ycsb, 'load'])
+        # Commands which can't be resolved are left alone
+        self.assertEqual(spawn_cmd(['psql', '-c']), ['psql', '-c'])
+
+    def test_copy_to_output(self):
+        copy_to_output = self.runner._Runner__copy_to_output
+        # The first copy of a source is a real copy
+        copy_to_output('foo', 'copy1')
+        self.assertNotEqual(os.stat('copy1').st_ino, os.stat('foo').st_ino)
+        with open('copy1') as f:
+            self.assertEqual(f.read(), FOO_WORKLOAD)
+        # Later copies are hard links to the first copy
+        copy_to_output('foo', 'copy2')
+        self.assertEqual(os.stat('copy2').st_ino, os.stat('copy1').st_ino)
+        # If linking fails, fall back to a real copy
+        os.remove('copy1')
+        copy_to_output('foo', 'copy3')
+        self.assertNotEqual(os.stat('copy3').st_ino, os.stat('copy2').st_ino)
+        self.assertNotEqual(os.stat('copy3').st_ino, os.stat('foo').st_ino)
+        with open('copy3') as f:
+            self.assertEqual(f.read(), FOO_WORKLOAD)
+        # ...which later copies are then linked to
+        copy_to_output('foo', 'copy4')
+        self.assertEqual(os.stat('copy4').st_ino, os.stat('copy3').st_ino)
 
+    # Note: the run tests rely on fake commands written as sh scripts, so
+    # probably only pass on Unix-compliant systems
     def test_run(self):
-        pass
+        exporting = []
+        def slow_export(export_stats):
+            def export():
+                # Exports from parallel DBs must not overlap
+                exporting.append(None)
+                self.assertEqual(len(exporting), 1)
+                sleep(0.05)
+                export_stats()
+                exporting.pop()
+            return export
+        # Set the slow exports up on each DB before it runs
+        def pre_db(db):
+            db.export_stats = slow_export(db.export_stats)
+        # Make sure both parallel DBs get a worker, even on a single CPU
+        with mock.patch('os.cpu_count', return_value=2):
+            runner, calls = self.run_runner('run.ini', hooks={'PRE_DB': [pre_db]})
+        dbs = {db.labelname: db for db in runner.dbs}
+        self.assertEqual(sorted(dbs), ['jdbc-postgres', 'mongodb', 'redis'])
+        # Each DB gets every row, in order
+        for db in dbs.values():
+            self.assertEqual(self.read_output(db), ['mpl,throughput,trial',
+                '1,1.0,1', '5,5.0,1', '1,1.0,2', '5,5.0,2'])
+        # Hooks
+        self.assertEqual(calls[0], ('PRE_RUN',))
+        self.assertEqual(calls[-1], ('POST_RUN',))
+        for name in dbs:
+            self.assertEqual([c for c in calls if name in c], [
+                ('PRE_DB', name),
+                ('PRE_TRIAL', 1, name),
+                ('PRE_MPL', 1, 1, name), ('POST_MPL', 1, 1, name),
+                ('PRE_MPL', 5, 1, name), ('POST_MPL', 5, 1, name),
+                ('POST_TRIAL', 1, name),
+                ('PRE_TRIAL', 2, name),
+                ('PRE_MPL', 1, 2, name), ('POST_MPL', 1, 2, name),
+                ('PRE_MPL', 5, 2, name), ('POST_MPL', 5, 2, name),
+                ('POST_TRIAL', 2, name),
+                ('POST_DB', name),
+            ])
+        # The serial DB only starts once both parallel DBs are done
+        self.assertGreater(calls.index(('PRE_DB', 'jdbc-postgres')),
+            max(calls.index(('POST_DB', 'redis')), calls.index(('POST_DB', 'mongodb'))))
+
+    def test_run_load_log(self):
+        runner, calls = self.run_runner('run.ini')
+        db, = [db for db in runner.dbs if db.labelname == 'redis']
+        with open(db.makefpath("log-{}-{}.log")) as f:
+            lines = [l for l in f.read().splitlines()
+                if 'Loading' in l or 'LOAD OUTPUT' in l or 'Running' in l]
+        # Load output goes between the runner's own lines, once per load
+        expected = []
+        for trial in (1, 2):
+            for mpl in (1, 5):
+                expected += [
+                    "(Trial=%i) (MPL=%i) Loading YCSB data..." % (trial, mpl),
+                    "LOAD OUTPUT redis",
+                    "(Trial=%i) (MPL=%i) Running YCSB workload..." % (trial, mpl),
+                ]
+        self.assertEqual(len(lines), len(expected))
+        for line, end in zip(lines, expected):
+            self.assertTrue(line.endswith(end), line)
+
+    def test_run_copy_error(self):
+        with open('serial.ini', 'w') as cf:
+            cf.write("[redis]\nworkload = foo\noutput_plots = off\n")
+        runner = Runner('serial.ini')
+        self.addCleanup(lambda: [db.cleanup() for db in runner.dbs])
+        # Copying the runner config to the output dir will now fail
+        os.remove('serial.ini')
+        with self.assertRaises(FileNotFoundError):
+            with contextlib.redirect_stdout(io.StringIO()):
+                runner.run()
+        # The error is raised before YCSB is first run (but after loading)
+        with open('calls') as f:
+            self.assertEqual(f.read().splitlines(), ["load redis 1"])
+
+    def test_run_no_mpls(self):
+        # No MPL lies between min_mpl and max_mpl, so no stats are collected
+        with open('run.ini', 'w') as cf:
+            cf.write(RUN_CONFIG.replace("min_mpl      = 1", "min_mpl      = 10"))
+        runner, calls = self.run_runner('run.ini')
+        self.assertFalse(os.path.exists('calls'))
+        for db in runner.dbs:
+            self.assertEqual(len(db.stats), 0)
+            for fname in os.listdir(db.outdirpath):
+                self.assertFalse(fname.startswith(('output-', 'averages-')), fname)
+            self.assertIn(('POST_TRIAL', 2, db.labelname), calls)
+            self.assertIn(('POST_DB', db.labelname), calls)
+
+    def test_run_parallel_error(self):
+        # Cleaning mongodb fails in its worker thread
+        self.write_script('mongo', "#!/bin/sh\nexit 1\n")
+        calls = []
+        with self.assertRaises(RuntimeError):
+            self.run_runner('run.ini', hooks={'PRE_DB': [calls.append]})
+        # The serial DB is never started
+        self.assertEqual(sorted(db.labelname for db in calls), ['mongodb', 'redis'])
 
     def test_extract_stats(self):
-        pass
+        stats = Runner.extract_stats(YCSB_OUTPUT)
+        self.assertEqual(stats.totalcash, 10000000.)
+        self.assertEqual(stats.countcash, 9999870.)
+        self.assertEqual(stats.opcount, 100000.)
+        self.assertEqual(stats.runtime, 5012.)
+        self.assertEqual(stats.throughput, 19952.11)
+        self.assertEqual(stats.latency_tx_rmw, 1283.42)
+        # Each stat should match the result of running its regex alone
+        for k, regex in const.STAT_REGEXPS.items():
+            m = Runner.get_re_match(regex, YCSB_OUTPUT)
+            self.assertEqual(getattr(stats, k), const.TRACKED_STATS[k](m))
+        # Missing stats keep their default values
+        stats = Runner.extract_stats("")
+        for k in const.STAT_REGEXPS:
+            self.assertEqual(getattr(stats, k), const.TRACKED_STATS[k]())
 
     def test_get_re_match(self):
-        pass
+        regex = re.compile(r"foo=([0-9]+)")
+        self.assertEqual(Runner.get_re_match(regex, "bar foo=12 foo=34"), "12")
+        self.assertIsNone(Runner.get_re_match(regex, "bar"))
+        # No capturing groups
+        self.assertIsNone(Runner.get_re_match(re.compile(r"foo"), "foo"))
 
     @classmethod
     def setUpClass(cls):
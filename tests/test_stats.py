@@ -16,6 +16,16 @@ class StatisticsTestCase(unittest.TestCase):
         for k, v in initvals.items():
             self.assertEqual(getattr(stats, k), v)
 
+    def test_init_dict(self):
+        k, v = self.statitem1
+        stats = Statistics({k: v() + 1})
+        self.assertEqual(getattr(stats, k), v() + 1)
+        # Keyword arguments take precedence over the dict
+        stats = Statistics({k: v() + 1}, **{k: v() + 2})
+        self.assertEqual(getattr(stats, k), v() + 2)
+        with self.assertRaises(AttributeError):
+            Statistics({noattr(Statistics()): 'foobar'})
+
     def test_default_values(self):
         for k, v in const.TRACKED_STATS.items():
             self.assertEqual(getattr(self.stats, k), v())